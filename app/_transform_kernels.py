@@ -0,0 +1,166 @@
+# _transform_kernels.py
+"""Numeric kernels for the per-tick GPX transform.
+
+Numba is an optional extra: when importable, the kernels are JIT-compiled
+(cached on disk after the first run) and run at C speed; otherwise the plain
+NumPy implementations are used unchanged.
+"""
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+if njit is not None:
+    from numba import prange
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _affine_apply_parallel(lats, lons, m00, m01, m10, m11, center_lat, center_lon, out_lats, out_lons):
+        for i in prange(lats.size):
+            dlon = lons[i] - center_lon
+            dlat = lats[i] - center_lat
+            out_lons[i] = center_lon + m00 * dlon + m01 * dlat
+            out_lats[i] = center_lat + m10 * dlon + m11 * dlat
+
+
+def make_affine_buffers(n):
+    """Allocate the (out_lats, out_lons, scratch_a, scratch_b) buffer set that
+    affine_apply can reuse across calls for an n-point track."""
+    return tuple(np.empty(n) for _ in range(4))
+
+
+def affine_apply(lats, lons, m00, m01, m10, m11, center_lat, center_lon, out=None):
+    """Apply a 2x2 matrix on (dlon, dlat) offsets about the given center.
+
+    Row 0 (m00, m01) produces the new dlon, row 1 (m10, m11) the new dlat,
+    matching MainWindow.build_transform_matrix. Pass ``out`` (a buffer set
+    from make_affine_buffers) to run allocation-free; with Numba present the
+    work is additionally split across cores.
+    """
+    if out is None:
+        out = make_affine_buffers(lats.size)
+    out_lats, out_lons, scratch_a, scratch_b = out
+
+    if njit is not None:
+        _affine_apply_parallel(lats, lons, m00, m01, m10, m11, center_lat, center_lon, out_lats, out_lons)
+        return out_lats, out_lons
+
+    np.subtract(lons, center_lon, out=scratch_a)  # dlon
+    np.subtract(lats, center_lat, out=scratch_b)  # dlat
+    np.multiply(scratch_b, m01, out=out_lats)  # out_lats as temp for m01*dlat
+    np.multiply(scratch_a, m00, out=out_lons)
+    out_lons += out_lats
+    out_lons += center_lon
+    np.multiply(scratch_a, m10, out=out_lats)
+    scratch_b *= m11
+    out_lats += scratch_b
+    out_lats += center_lat
+    return out_lats, out_lons
+
+
+if njit is not None:
+
+    @njit(cache=True, fastmath=True)
+    def _haversine_length_jit(lats, lons):
+        earth_radius = 6371000.0
+        total = 0.0
+        for i in range(1, lats.size):
+            phi1 = math.radians(lats[i - 1])
+            phi2 = math.radians(lats[i])
+            dphi = phi2 - phi1
+            dlam = math.radians(lons[i] - lons[i - 1])
+            a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlam / 2) ** 2
+            total += 2 * earth_radius * math.asin(math.sqrt(a))
+        return total
+
+
+def haversine_length_m(lats, lons):
+    """Total great-circle polyline length in meters.
+
+    With Numba present this is one compiled loop with no temporaries; the
+    fallback is the vectorized formulation over diffed arrays.
+    """
+    if lats.size < 2:
+        return 0.0
+    if njit is not None:
+        return _haversine_length_jit(lats, lons)
+    earth_radius = 6371000.0
+    phi = np.radians(lats)
+    dphi = np.diff(phi)
+    dlam = np.radians(np.diff(lons))
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi[:-1]) * np.cos(phi[1:]) * np.sin(dlam / 2) ** 2
+    return float((2 * earth_radius * np.arctan2(np.sqrt(a), np.sqrt(1 - a))).sum())
+
+
+if njit is not None:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _bezier_sample_jit(ctrls, basis, out):
+        for i in prange(ctrls.shape[0]):
+            for j in range(basis.shape[0]):
+                acc = 0j
+                for k in range(ctrls.shape[1]):
+                    acc += basis[j, k] * ctrls[i, k]
+                out[i, j] = acc
+
+
+# Below this, BLAS setup overhead stops dominating and the parallel kernel
+# wins; above the Numba warm-up cost, small SVGs stay on the matmul.
+_BEZIER_JIT_THRESHOLD = 10_000
+
+
+def bezier_sample(ctrls, basis):
+    """Sample complex Bezier control rows against a Bernstein basis.
+
+    Equivalent to ``ctrls @ basis.T`` for an (n, k) control matrix and an
+    (N, k) basis. Large batches are dispatched to a parallel Numba kernel
+    that writes the (n, N) output directly, with no BLAS temporaries.
+    """
+    if njit is None or ctrls.shape[0] * basis.shape[0] <= _BEZIER_JIT_THRESHOLD:
+        return ctrls @ basis.T
+    out = np.empty((ctrls.shape[0], basis.shape[0]), dtype=np.complex128)
+    _bezier_sample_jit(ctrls, basis, out)
+    return out
+
+
+def rdp_keep_mask(lats, lons, eps):
+    """Ramer-Douglas-Peucker keep-mask for a polyline, iterative (stack-based).
+
+    Returns a boolean array marking the points that survive simplification
+    with tolerance ``eps`` (in degrees). The per-span distance computation is
+    vectorized, so this stays fast without a JIT.
+    """
+    n = lats.size
+    keep = np.zeros(n, dtype=np.bool_)
+    if n == 0:
+        return keep
+    keep[0] = True
+    keep[-1] = True
+    if n <= 2:
+        return keep
+
+    stack = [(0, n - 1)]
+    while stack:
+        s, e = stack.pop()
+        if e <= s + 1:
+            continue
+        dlon = lons[e] - lons[s]
+        dlat = lats[e] - lats[s]
+        span_lon = lons[s + 1:e]
+        span_lat = lats[s + 1:e]
+        norm = np.hypot(dlon, dlat)
+        if norm == 0.0:
+            dist = np.hypot(span_lon - lons[s], span_lat - lats[s])
+        else:
+            dist = np.abs(dlat * span_lon - dlon * span_lat + lons[e] * lats[s] - lats[e] * lons[s]) / norm
+        idx = int(np.argmax(dist))
+        if dist[idx] > eps:
+            i = s + 1 + idx
+            keep[i] = True
+            stack.append((s, i))
+            stack.append((i, e))
+    return keep
@@ -1,22 +1,40 @@
 from PyQt5.QtSvg import QSvgWidget
-from PyQt5.QtCore import QRectF
-from PyQt5.QtGui import QPainter
+from PyQt5.QtCore import QRectF, Qt
+from PyQt5.QtGui import QPainter, QPixmap
 
 class AspectRatioSvgWidget(QSvgWidget):
     """
     A QSvgWidget that maintains the aspect ratio of the SVG file.
+
+    The aspect ratio, target rect and a rasterized pixmap are cached so that
+    repaints only redo work when the SVG or the widget size actually changes.
     """
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        renderer = self.renderer()
-        if not renderer.isValid():
-            return super().paintEvent(event)
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._invalidate_cache()
+
+    def load(self, *args, **kwargs):
+        self._invalidate_cache()
+        return super().load(*args, **kwargs)
+
+    def _invalidate_cache(self):
+        self._cached_ratio = None
+        self._cached_size = None
+        self._cached_target_rect = None
+        self._cached_pixmap = None
+
+    def _target_rect(self):
         widget_rect = self.rect()
-        default_size = renderer.defaultSize()
+        if self._cached_target_rect is not None and self._cached_size == widget_rect.size():
+            return self._cached_target_rect
+
+        default_size = self.renderer().defaultSize()
         if default_size.isEmpty():
-            target_rect = widget_rect
+            target_rect = QRectF(widget_rect)
         else:
-            default_ratio = default_size.width() / default_size.height()
+            if self._cached_ratio is None:
+                self._cached_ratio = default_size.width() / default_size.height()
+            default_ratio = self._cached_ratio
             widget_ratio = widget_rect.width() / widget_rect.height()
             if widget_ratio > default_ratio:
                 new_width = int(widget_rect.height() * default_ratio)
@@ -30,5 +48,43 @@ class AspectRatioSvgWidget(QSvgWidget):
                 y = (widget_rect.height() - new_height) // 2
             target_rect = QRectF(x, y, new_width, new_height)
 
+        self._cached_size = widget_rect.size()
+        self._cached_target_rect = target_rect
+        self._cached_pixmap = None  # Size changed so the pixmap must be re-rendered
+        return target_rect
+
+    def paintEvent(self, event):
+        if not self.isVisible() or self.rect().isEmpty():
+            return
 
-        renderer.render(painter, target_rect)
\ No newline at end of file
+        renderer = self.renderer()
+        if not renderer.isValid():
+            return super().paintEvent(event)
+
+        target_rect = self._target_rect()
+        # Rasterize at the physical resolution so HiDPI screens get the same
+        # sharpness as direct vector rendering; re-render if the widget moves
+        # to a screen with a different device pixel ratio.
+        dpr = self.devicePixelRatioF()
+        if self._cached_pixmap is not None and self._cached_pixmap.devicePixelRatio() != dpr:
+            self._cached_pixmap = None
+        if self._cached_pixmap is None:
+            pixmap = QPixmap((target_rect.size() * dpr).toSize())
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(Qt.transparent)
+            pixmap_painter = QPainter(pixmap)
+            try:
+                renderer.render(pixmap_painter, QRectF(0, 0, target_rect.width(), target_rect.height()))
+            finally:
+                pixmap_painter.end()
+            self._cached_pixmap = pixmap
+
+        # End the painter explicitly instead of leaving the device locked until GC
+        painter = QPainter(self)
+        try:
+            # Composite only the exposed region: partial exposes (pane resize,
+            # overlapping windows) then touch just the dirty pixels.
+            painter.setClipRegion(event.region())
+            painter.drawPixmap(target_rect.topLeft(), self._cached_pixmap)
+        finally:
+            painter.end()
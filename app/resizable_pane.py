@@ -36,6 +36,30 @@ class PaneManager(QSplitter):
 class ResizablePane(QWidget):
     toggleMode = pyqtSignal(str)  # Emits "maximize" or "normal"
 
+    # Pre-decoded GIF frames shared by all panes so each instance does not
+    # re-run the GIF decoder and allocate a fresh QIcon per frame.
+    _expand_icons = None
+    _collapse_icons = None
+
+    @classmethod
+    def _load_icon_frames(cls):
+        if cls._expand_icons is None:
+            cls._expand_icons = cls._decode_gif_frames("icons/icons8-expand.gif")
+            cls._collapse_icons = cls._decode_gif_frames("icons/icons8-collapse.gif")
+
+    @staticmethod
+    def _decode_gif_frames(file_name):
+        movie = QMovie(file_name)
+        movie.setScaledSize(QSize(48, 48))
+        movie.jumpToFrame(0)  # Force the decoder to load the file
+        icons = [QIcon()]
+        if movie.frameCount() > 0:
+            icons = []
+            for i in range(movie.frameCount()):
+                movie.jumpToFrame(i)
+                icons.append(QIcon(movie.currentPixmap()))
+        return icons
+
     def __init__(self, title, content_widget, pane_id):
         super().__init__()
         self.pane_id = pane_id
@@ -54,62 +78,28 @@ class ResizablePane(QWidget):
 
         # "Expand" icon indicates that clicking will maximize.
         # "Collapse" icon indicates that clicking will restore normal state.
-        self.movie_expand = QMovie("icons/icons8-expand.gif")
-        self.movie_collapse = QMovie("icons/icons8-collapse.gif")
-        self.movie_expand.setScaledSize(QSize(48, 48))
-        self.movie_collapse.setScaledSize(QSize(48, 48))
-
-        # Connect signals so that animations update the icon as they run.
-        self.movie_expand.frameChanged.connect(self.on_expand_frame_changed)
-        self.movie_collapse.frameChanged.connect(self.on_collapse_frame_changed)
-
-        # Prime the movies so that a frame is available immediately.
-        self._prime_movies()
+        self._load_icon_frames()
 
         # Initially, we are in normal state so show the expand icon.
-        self.toggle_button.setIcon(QIcon(self.movie_expand.currentPixmap()))
+        self._state = "normal"
+        self._apply_state("normal")
 
         self.toggle_button.clicked.connect(self.toggle_fullscreen)
         self.toggle_button.raise_()
 
-    def _prime_movies(self):
-        # Start and immediately stop the movies to ensure a valid pixmap is loaded.
-        self.movie_expand.start()
-        self.movie_expand.jumpToFrame(0)
-        self.movie_expand.stop()
-        self.movie_collapse.start()
-        last_frame = self.movie_collapse.frameCount() - 1
-        if last_frame < 0:
-            last_frame = 0
-        self.movie_collapse.jumpToFrame(last_frame)
-        self.movie_collapse.stop()
+    def _apply_state(self, state):
+        """Set the toggle state and the matching cached icon directly,
+        without spinning the QMovie decoder through start/jump/stop."""
+        self._state = state
+        self.toggle_button.setChecked(state == "maximized")
+        if state == "maximized":
+            self.toggle_button.setIcon(self._collapse_icons[-1])
+        else:
+            self.toggle_button.setIcon(self._expand_icons[0])
 
     def toggle_fullscreen(self):
-        if self.toggle_button.isChecked():
-            # Transitioning to maximize: show collapse icon.
-            self.movie_collapse.start()
-            last_frame = self.movie_collapse.frameCount() - 1
-            if last_frame < 0:
-                last_frame = 0
-            self.movie_collapse.jumpToFrame(last_frame)
-            self.movie_collapse.stop()
-            self.toggleMode.emit("maximize")
-        else:
-            # Transitioning to normal: show expand icon.
-            self.movie_expand.start()
-            self.movie_expand.jumpToFrame(0)
-            self.movie_expand.stop()
-            self.toggleMode.emit("normal")
-
-    def on_expand_frame_changed(self, frame_number):
-        self.toggle_button.setIcon(QIcon(self.movie_expand.currentPixmap()))
-        if frame_number == self.movie_expand.frameCount() - 1:
-            self.movie_expand.stop()
-
-    def on_collapse_frame_changed(self, frame_number):
-        self.toggle_button.setIcon(QIcon(self.movie_collapse.currentPixmap()))
-        if frame_number == self.movie_collapse.frameCount() - 1:
-            self.movie_collapse.stop()
+        self._apply_state("maximized" if self.toggle_button.isChecked() else "normal")
+        self.toggleMode.emit("maximize" if self._state == "maximized" else "normal")
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
@@ -130,23 +120,8 @@ class ResizablePane(QWidget):
 
     def set_normal_state(self):
         """Force the pane into normal state (showing the expand icon)."""
-        self.toggle_button.setChecked(False)
-        self.movie_expand.stop()
-        self.movie_collapse.stop()
-        self.movie_expand.start()
-        self.movie_expand.jumpToFrame(0)
-        self.movie_expand.stop()
-        self.toggle_button.setIcon(QIcon(self.movie_expand.currentPixmap()))
+        self._apply_state("normal")
 
     def set_maximized_state(self):
         """Force the pane into maximized state (showing the collapse icon)."""
-        self.toggle_button.setChecked(True)
-        self.movie_expand.stop()
-        self.movie_collapse.stop()
-        self.movie_collapse.start()
-        last_frame = self.movie_collapse.frameCount() - 1
-        if last_frame < 0:
-            last_frame = 0
-        self.movie_collapse.jumpToFrame(last_frame)
-        self.movie_collapse.stop()
-        self.toggle_button.setIcon(QIcon(self.movie_collapse.currentPixmap()))
+        self._apply_state("maximized")
@@ -1,129 +1,168 @@
 # svg_gpx_manager.py
 import os
-import copy
+import xml.etree.ElementTree as ET
 import numpy as np
-import matplotlib.pyplot as plt
 import gpxpy
 import gpxpy.gpx
-from svgpathtools import svg2paths, Line, CubicBezier, QuadraticBezier
-from geopy.distance import geodesic
-import geopy.distance
+
+from app._transform_kernels import bezier_sample, haversine_length_m, rdp_keep_mask
+
+# svgpathtools is imported lazily (like matplotlib) so that app startup only
+# pays for it once SVG processing is requested.
+
+
+class PlainTrackGPX(gpxpy.gpx.GPX):
+    """Marker class for GPX trees built by convert_svg_to_gpx.
+
+    Such trees carry nothing but lat/lon track points by construction, so
+    save_gpx can stream their XML without consulting gpxpy's serializer.
+    Trees parsed from disk stay plain gpxpy.gpx.GPX and keep full fidelity.
+    The subclass survives deepcopy, so the transformed copies downstream
+    remain eligible for the fast save path.
+    """
 
 
 class SvgGpxManager:
+    # Bernstein bases for the fixed 100-sample plot resolution, shared across
+    # instances and computed lazily on first plot.
+    _plot_cubic_basis = None
+    _plot_quad_basis = None
+
     def __init__(self, target_size_meters=100, center_lat=54.904643, center_lon=23.957831, interpolation_points=3):
         self.target_size_meters = target_size_meters
         self.center_lat = center_lat
         self.center_lon = center_lon
         self.interpolation_points = interpolation_points
 
-    def load_svg(self, file_name):
+        # Interpolation bases depend only on interpolation_points, so compute once
+        t_vals = np.linspace(0, 1, self.interpolation_points)
+        self._cubic_basis = self.cubic_bernstein_basis(t_vals)
+        self._quad_basis = self.quadratic_bernstein_basis(t_vals)
+
+    def load_svg_bytes(self, file_name):
+        """Read the SVG once into memory so that Qt (QSvgRenderer.load on a
+        QByteArray) and svgpathtools can both parse the same buffer instead of
+        each doing its own disk read."""
         if not os.path.exists(file_name):
             raise FileNotFoundError(f"SVG file not found: {file_name}")
-        svg_paths, _ = svg2paths(file_name)
+        with open(file_name, "rb") as f:
+            return f.read()
+
+    def load_svg(self, file_name):
+        from io import BytesIO
+        from svgpathtools import svg2paths
+
+        # Binary buffer: the XML parser then honors the file's declared
+        # encoding instead of assuming UTF-8.
+        svg_paths, _ = svg2paths(BytesIO(self.load_svg_bytes(file_name)))
         return svg_paths
 
+    @staticmethod
+    def cubic_bernstein_basis(t_vals):
+        return np.stack(
+            [(1 - t_vals) ** 3, 3 * (1 - t_vals) ** 2 * t_vals, 3 * (1 - t_vals) * t_vals**2, t_vals**3], axis=1
+        )
+
+    @staticmethod
+    def quadratic_bernstein_basis(t_vals):
+        return np.stack([(1 - t_vals) ** 2, 2 * (1 - t_vals) * t_vals, t_vals**2], axis=1)
+
+    def iter_paths(self, file_name):
+        """Yield svgpathtools Path objects one at a time via a streaming XML parse.
+
+        Unlike svg2paths this never materializes the whole SVG DOM plus all
+        path objects at once, so very large files can be fed straight into
+        convert_svg_to_gpx in bounded memory.
+        """
+        from svgpathtools import parse_path
+
+        if not os.path.exists(file_name):
+            raise FileNotFoundError(f"SVG file not found: {file_name}")
+        for _, elem in ET.iterparse(file_name, events=("end",)):
+            if elem.tag == "path" or elem.tag.endswith("}path"):
+                d = elem.attrib.get("d")
+                if d:
+                    yield parse_path(d)
+            elem.clear()
+
     def convert_svg_to_gpx(self, svg_paths):
-        gpx = gpxpy.gpx.GPX()
+        from svgpathtools import Line, CubicBezier, QuadraticBezier
+
+        gpx = PlainTrackGPX()
         track = gpxpy.gpx.GPXTrack()
         gpx.tracks.append(track)
         segment = gpxpy.gpx.GPXTrackSegment()
         track.segments.append(segment)
 
+        # Classify segments first so each Bezier family is sampled in one
+        # vectorized matmul instead of a per-segment np.linspace + Python loop.
+        # The matmuls below go through BLAS, which parallelizes across cores on
+        # its own for large SVGs; the gather loop here is GIL-bound attribute
+        # access, so a Python-level thread pool would not speed it up.
+        # svgpathtools returns exact segment classes, so `type(...) is` dispatch
+        # is safe and noticeably cheaper than isinstance in this hot loop.
+        order = []  # (kind, index into that kind's sample array), keeps path order
+        lines, cubics, quads = [], [], []
         for path in svg_paths:
             for seg in path:
-                if isinstance(seg, Line):
-                    self.process_line(seg, segment)
-                elif isinstance(seg, (CubicBezier, QuadraticBezier)):
-                    self.process_bezier(seg, segment)
+                seg_type = type(seg)
+                if seg_type is Line:
+                    order.append(("line", len(lines)))
+                    lines.append((seg.start, seg.end))
+                elif seg_type is CubicBezier:
+                    order.append(("cubic", len(cubics)))
+                    cubics.append((seg.start, seg.control1, seg.control2, seg.end))
+                elif seg_type is QuadraticBezier:
+                    order.append(("quad", len(quads)))
+                    quads.append((seg.start, seg.control, seg.end))
+
+        sampled = {
+            "line": np.asarray(lines, dtype=np.complex128).reshape(-1, 2),
+            "cubic": bezier_sample(np.asarray(cubics, dtype=np.complex128).reshape(-1, 4), self._cubic_basis),
+            "quad": bezier_sample(np.asarray(quads, dtype=np.complex128).reshape(-1, 3), self._quad_basis),
+        }
+        # Flip y for GPX conversion; .tolist() converts to Python floats once
+        # instead of per-element np.float64 coercion inside GPXTrackPoint.
+        latlons = {kind: ((-arr.imag).tolist(), arr.real.tolist()) for kind, arr in sampled.items()}
+
+        for kind, idx in order:
+            lats, lons = latlons[kind]
+            segment.points.extend(gpxpy.gpx.GPXTrackPoint(lat, lon) for lat, lon in zip(lats[idx], lons[idx]))
         return gpx
 
-    def process_line(self, seg, gpx_segment):
-        points = [(seg.start.real, seg.start.imag), (seg.end.real, seg.end.imag)]
-        for pt in points:
-            # Flip y for GPX conversion
-            gpx_segment.points.append(gpxpy.gpx.GPXTrackPoint(-pt[1], pt[0]))
+    def _coords_array(self, gpx):
+        """Flatten all track points into a list plus an (N, 2) lat/lon float64 array."""
+        points = list(gpx.walk(only_points=True))
+        coords = np.fromiter(
+            (v for p in points for v in (p.latitude, p.longitude)), dtype=np.float64, count=2 * len(points)
+        ).reshape(-1, 2)
+        return points, coords
 
-    def process_bezier(self, seg, gpx_segment):
-        t_vals = np.linspace(0, 1, self.interpolation_points)
-        if isinstance(seg, CubicBezier):
-            x_vals, y_vals = self.calculate_cubic_bezier(seg, t_vals)
-        else:  # QuadraticBezier
-            x_vals, y_vals = self.calculate_quadratic_bezier(seg, t_vals)
-        for x, y in zip(x_vals, y_vals):
-            gpx_segment.points.append(gpxpy.gpx.GPXTrackPoint(-y, x))
-
-    def calculate_cubic_bezier(self, seg, t_vals):
-        x_vals = (
-            (1 - t_vals) ** 3 * seg.start.real
-            + 3 * (1 - t_vals) ** 2 * t_vals * seg.control1.real
-            + 3 * (1 - t_vals) * t_vals**2 * seg.control2.real
-            + t_vals**3 * seg.end.real
-        )
-        y_vals = (
-            (1 - t_vals) ** 3 * seg.start.imag
-            + 3 * (1 - t_vals) ** 2 * t_vals * seg.control1.imag
-            + 3 * (1 - t_vals) * t_vals**2 * seg.control2.imag
-            + t_vals**3 * seg.end.imag
-        )
-        return x_vals, y_vals
-
-    def calculate_quadratic_bezier(self, seg, t_vals):
-        x_vals = (1 - t_vals) ** 2 * seg.start.real + 2 * (1 - t_vals) * t_vals * seg.control.real + t_vals**2 * seg.end.real
-        y_vals = (1 - t_vals) ** 2 * seg.start.imag + 2 * (1 - t_vals) * t_vals * seg.control.imag + t_vals**2 * seg.end.imag
-        return x_vals, y_vals
-
-    def scale_gpx_initial(self, gpx):
-        scale_down_factor = 0.000001  # Adjust coordinate range
-        latitudes = [p.latitude for track in gpx.tracks for seg in track.segments for p in seg.points]
-        longitudes = [p.longitude for track in gpx.tracks for seg in track.segments for p in seg.points]
-        min_lat = min(latitudes) * scale_down_factor
-        max_lat = max(latitudes) * scale_down_factor
-        min_lon = min(longitudes) * scale_down_factor
-        max_lon = max(longitudes) * scale_down_factor
-
-        height = geodesic((min_lat, min_lon), (max_lat, min_lon)).meters
-        width = geodesic((min_lat, min_lon), (min_lat, max_lon)).meters
-        largest_dimension = max(height, width)
-        scale_factor = self.target_size_meters / largest_dimension * scale_down_factor
-
-        new_gpx = gpxpy.gpx.GPX()
-        track = gpxpy.gpx.GPXTrack()
-        new_gpx.tracks.append(track)
-        segment = gpxpy.gpx.GPXTrackSegment()
-        track.segments.append(segment)
+    def scale_and_center_gpx(self, gpx):
+        """Scale the drawing to target_size_meters and move it to the configured
+        center, touching every point exactly once."""
+        points, coords = self._coords_array(gpx)
+        mins = coords.min(axis=0)
+        spans = coords.max(axis=0) - mins
 
-        for t in gpx.tracks:
-            for seg in t.segments:
-                for p in seg.points:
-                    lat_diff = p.latitude - min_lat
-                    lon_diff = p.longitude - min_lon
-                    scaled_lat = min_lat + lat_diff * scale_factor
-                    scaled_lon = min_lon + lon_diff * scale_factor
-                    segment.points.append(gpxpy.gpx.GPXTrackPoint(scaled_lat, scaled_lon))
-        return new_gpx
-
-    def center_gpx_at(self, gpx):
-        latitudes = [p.latitude for track in gpx.tracks for seg in track.segments for p in seg.points]
-        longitudes = [p.longitude for track in gpx.tracks for seg in track.segments for p in seg.points]
-        current_center_lat = np.mean(latitudes)
-        current_center_lon = np.mean(longitudes)
-
-        lat_offset = self.center_lat - current_center_lat
-        lon_offset = self.center_lon - current_center_lon
+        # SVG user units are mapped onto (tiny) degrees, so the bounding box
+        # converts to meters linearly; the old scale_down_factor round-trip
+        # through a geodesic solver canceled itself out of the result anyway.
+        meters_per_degree = np.pi / 180.0 * 6371000.0
+        largest_dimension = spans.max() * meters_per_degree
+        scale_factor = self.target_size_meters / largest_dimension
 
-        for track in gpx.tracks:
-            for seg in track.segments:
-                for p in seg.points:
-                    p.latitude += lat_offset
-                    p.longitude += lon_offset
+        scaled = mins + (coords - mins) * scale_factor
+        offset = np.array([self.center_lat, self.center_lon]) - scaled.mean(axis=0)
+        for p, (lat, lon) in zip(points, (scaled + offset).tolist()):
+            p.latitude = lat
+            p.longitude = lon
         return gpx
 
     def process_svg_file(self, file_name):
         svg_paths = self.load_svg(file_name)
         gpx = self.convert_svg_to_gpx(svg_paths)
-        gpx = self.scale_gpx_initial(gpx)
-        gpx = self.center_gpx_at(gpx)
+        gpx = self.scale_and_center_gpx(gpx)
         return svg_paths, gpx
 
     def load_gpx(self, file_name):
@@ -134,6 +173,8 @@ class SvgGpxManager:
         return gpx
 
     def display_svg_and_gpx(self, svg_paths, gpx):
+        import matplotlib.pyplot as plt  # Deferred: keeps app startup off matplotlib's import cost
+
         fig, (ax1, ax2) = plt.subplots(2, 1)
         self.plot_svg(svg_paths, ax1)
         ax1.set_title("SVG Path")
@@ -145,6 +186,8 @@ class SvgGpxManager:
         plt.show()
 
     def display_gpx_only(self, gpx):
+        import matplotlib.pyplot as plt  # Deferred: keeps app startup off matplotlib's import cost
+
         fig, ax = plt.subplots()
         self.plot_gpx(gpx, ax)
         ax.set_title("GPX Path")
@@ -154,70 +197,120 @@ class SvgGpxManager:
         plt.tight_layout()
         plt.show()
 
+    @classmethod
+    def _ensure_plot_bases(cls):
+        if cls._plot_cubic_basis is None:
+            t_vals = np.linspace(0, 1, 100)
+            cls._plot_cubic_basis = cls.cubic_bernstein_basis(t_vals)
+            cls._plot_quad_basis = cls.quadratic_bernstein_basis(t_vals)
+
     def plot_svg(self, paths, ax):
+        from svgpathtools import Line, CubicBezier, QuadraticBezier
+        from matplotlib.collections import LineCollection
+
+        cls = type(self)
+        cls._ensure_plot_bases()
+
+        # One LineCollection + one endpoint plot instead of per-segment
+        # ax.plot calls, which would create O(N) Line2D artists.
+        polylines = []
+        node_x, node_y = [], []
         for path in paths:
             for seg in path:
-                if isinstance(seg, Line):
-                    x = [seg.start.real, seg.end.real]
-                    y = [-seg.start.imag, -seg.end.imag]  # Flip y for display
-                    ax.plot(x, y, "b-", lw=1)
-                    ax.plot(x, y, "ko")
-                elif isinstance(seg, (CubicBezier, QuadraticBezier)):
-                    self.plot_bezier_curve(seg, ax)
-
-    def plot_bezier_curve(self, seg, ax):
-        t_vals = np.linspace(0, 1, 100)
-        if isinstance(seg, CubicBezier):
-            x_vals, y_vals = self.calculate_cubic_bezier(seg, t_vals)
-        else:
-            x_vals, y_vals = self.calculate_quadratic_bezier(seg, t_vals)
-        ax.plot(x_vals, -y_vals, "b-", lw=1)  # Flip y for display
-        ax.plot([seg.start.real, seg.end.real], [-seg.start.imag, -seg.end.imag], "ko")
+                seg_type = type(seg)
+                if seg_type is Line:
+                    pts = np.array([[seg.start.real, -seg.start.imag], [seg.end.real, -seg.end.imag]])
+                elif seg_type is CubicBezier:
+                    z = cls._plot_cubic_basis @ np.array([seg.start, seg.control1, seg.control2, seg.end])
+                    pts = np.column_stack([z.real, -z.imag])  # Flip y for display
+                elif seg_type is QuadraticBezier:
+                    z = cls._plot_quad_basis @ np.array([seg.start, seg.control, seg.end])
+                    pts = np.column_stack([z.real, -z.imag])
+                else:
+                    continue
+                polylines.append(pts)
+                node_x.extend((seg.start.real, seg.end.real))
+                node_y.extend((-seg.start.imag, -seg.end.imag))
 
-    def plot_gpx(self, gpx, ax):
-        for track in gpx.tracks:
-            for seg in track.segments:
-                lats = [p.latitude for p in seg.points]
-                lons = [p.longitude for p in seg.points]
-                ax.plot(lons, lats, "ro-", lw=2)
+        if polylines:
+            ax.add_collection(LineCollection(polylines, colors="b", linewidths=1))
+            ax.plot(node_x, node_y, "ko", linestyle="none")
+        ax.autoscale_view()
+
+    def plot_gpx(self, gpx, ax, simplify_eps=None):
+        from matplotlib.collections import LineCollection
+
+        # Create the artists once and fill them via update_gpx_plot, so callers
+        # can keep (line_collection, markers) and refresh in place later.
+        line_collection = LineCollection([], colors="r", linewidths=2)
+        ax.add_collection(line_collection)
+        (markers,) = ax.plot([], [], "ro", linestyle="none")
         ax.set_xlabel("Longitude")
         ax.set_ylabel("Latitude")
+        artists = (line_collection, markers)
+        self.update_gpx_plot(gpx, ax, artists, simplify_eps=simplify_eps)
+        return artists
+
+    def update_gpx_plot(self, gpx, ax, artists, simplify_eps=None):
+        """Refresh the artists returned by plot_gpx with new coordinates,
+        avoiding a figure rebuild on every transform tick. ``simplify_eps``
+        (degrees) optionally thins near-collinear runs for display only."""
+        line_collection, markers = artists
+        polylines = []
+        for track in gpx.tracks:
+            for seg in track.segments:
+                if not seg.points:
+                    continue
+                pts = np.array([[p.longitude, p.latitude] for p in seg.points])
+                if simplify_eps and len(pts) > 2:
+                    pts = pts[rdp_keep_mask(pts[:, 1], pts[:, 0], simplify_eps)]
+                polylines.append(pts)
+        line_collection.set_segments(polylines)
+        if polylines:
+            all_pts = np.concatenate(polylines)
+            markers.set_data(all_pts[:, 0], all_pts[:, 1])
+        else:
+            markers.set_data([], [])
+        # The markers cover every point, so relim on lines alone is sufficient.
+        ax.relim()
+        ax.autoscale_view()
 
     def calculate_gpx_length_km(self, gpx):
-        total_length = 0.0
+        # Haversine per segment via the shared kernel (Numba-compiled when
+        # available) instead of a geopy geodesic solve per point pair.
+        total_meters = 0.0
         for track in gpx.tracks:
             for segment in track.segments:
                 pts = segment.points
-                for i in range(1, len(pts)):
-                    p1 = pts[i - 1]
-                    p2 = pts[i]
-                    total_length += geopy.distance.distance((p1.latitude, p1.longitude), (p2.latitude, p2.longitude)).kilometers
-        return total_length
+                if len(pts) < 2:
+                    continue
+                lats = np.fromiter((p.latitude for p in pts), dtype=np.float64, count=len(pts))
+                lons = np.fromiter((p.longitude for p in pts), dtype=np.float64, count=len(pts))
+                total_meters += haversine_length_m(lats, lons)
+        return total_meters / 1000.0
 
     def save_gpx(self, gpx_data, save_path):
+        # to_xml() spends its time building an element tree per point, so
+        # trees this app built from an SVG (bare lat/lon by construction, see
+        # PlainTrackGPX) have their fixed trkpt markup streamed directly.
+        # Anything parsed from disk may carry metadata, extensions, per-point
+        # fields etc. and always goes through gpxpy, so nothing is dropped.
         with open(save_path, "w") as f:
-            f.write(gpx_data.to_xml())
-
-    def get_path_center_lat_lon(self, gpx):
-        latitudes = [p.latitude for track in gpx.tracks for seg in track.segments for p in seg.points]
-        longitudes = [p.longitude for track in gpx.tracks for seg in track.segments for p in seg.points]
-
-        if not latitudes:
-            return (None,)
-        None
-
-        center_lat = np.mean(latitudes)
-        center_lon = np.mean(longitudes)
-
-        return center_lat, center_lon
-
-    def scale_gpx_around_point(self, gpx, center_lat, center_lon, scale_factor):
-        """Scale all points in tracks around the given center coordinates."""
-        new_gpx = copy.deepcopy(gpx)
-        for track in new_gpx.tracks:
-            for segment in track.segments:
-                for p in segment.points:
-                    p.latitude = center_lat + scale_factor * (p.latitude - center_lat)
-                    p.longitude = center_lon + scale_factor * (p.longitude - center_lon)
-
-        return new_gpx
+            if not isinstance(gpx_data, PlainTrackGPX):
+                f.write(gpx_data.to_xml())
+                return
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+            f.write('<gpx xmlns="http://www.topografix.com/GPX/1/1" version="1.1" creator="GPS-Strava-Art-Maker">\n')
+            for track in gpx_data.tracks:
+                f.write("<trk>\n")
+                for segment in track.segments:
+                    f.write("<trkseg>\n")
+                    f.write(
+                        "".join(
+                            f'<trkpt lat="{p.latitude:.10f}" lon="{p.longitude:.10f}"></trkpt>\n'
+                            for p in segment.points
+                        )
+                    )
+                    f.write("</trkseg>\n")
+                f.write("</trk>\n")
+            f.write("</gpx>\n")
@@ -4,8 +4,18 @@ import sys
 import os
 import copy
 import math
-import folium
-from PyQt5.QtCore import Qt, QTimer
+import numpy as np
+
+# folium is imported lazily in _get_map_html_template: it is only needed to
+# render the map template once, and it pulls in branca/jinja2 at import time.
+
+try:
+    import orjson  # Optional: ~5-10x faster than stdlib json for numeric arrays
+except ImportError:
+    orjson = None
+from PyQt5.QtCore import Qt, QTimer, QObject, QSignalBlocker, pyqtSlot
+from PyQt5.QtGui import QIntValidator, QDoubleValidator
+from PyQt5.QtWebChannel import QWebChannel
 from PyQt5.QtWebEngineWidgets import QWebEngineView
 from PyQt5.QtWidgets import (
     QApplication,
@@ -20,11 +30,29 @@ from PyQt5.QtWidgets import (
     QLineEdit,
 )
 from app.svg_gpx_manager import SvgGpxManager
+from app._transform_kernels import affine_apply, make_affine_buffers, rdp_keep_mask
 from app.mpl_canvas import MplCanvas
 from app.resizable_pane import ResizablePane, PaneManager
 
 
+class MarkerDragBridge(QObject):
+    """Receives push notifications from the embedded Leaflet map, replacing
+    the old 500 ms runJavaScript polling loop."""
+
+    def __init__(self, window):
+        super().__init__(window)
+        self._window = window
+
+    @pyqtSlot('QVariantList')
+    def on_marker_drag_end(self, coords):
+        # QWebChannel marshals the JS array of [lat, lng] pairs straight into
+        # Python lists; no JSON.stringify/json.loads round-trip needed.
+        self._window.translate_gpx_with_marker(coords)
+
+
 class MainWindow(QMainWindow):
+    DISPLAY_SIMPLIFY_EPS_DEG = 1e-5  # RDP tolerance for display copies, ~1 m
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("GPS Strava Art Maker")
@@ -36,14 +64,41 @@ class MainWindow(QMainWindow):
         self.gpx_data_2_scaled_translated = None
         self.gpx_data_3_final = None
 
+        # Cached SoA view of gpx_data_2 plus the point objects of the final
+        # tree, so update_final_gpx runs without a deepcopy per tick.
+        self._base_points = []
+        self._base_lats = np.empty(0)
+        self._base_lons = np.empty(0)
+        self._final_points = []
+        self._last_display_coords = []
+        self._affine_buffers = None
+
         self.project_path = os.getcwd()
         self.plot_canvas = MplCanvas(self, width=5, height=4, dpi=100)
         self.map_view = QWebEngineView()
 
+        # JS pushes marker-drag results through this channel instead of being polled.
+        self.drag_bridge = MarkerDragBridge(self)
+        self.web_channel = QWebChannel(self)
+        self.web_channel.registerObject("bridge", self.drag_bridge)
+        self.map_view.page().setWebChannel(self.web_channel)
+
         # Additional transform parameters:
         self.rotation = 0  # degrees (applied after horizontal scaling)
         self.hor_scale = 1.0  # horizontal scaling factor (1.0 = 100%)
 
+        # Composed 2x2 transform, rebuilt only when rotation/stretch/centroid change
+        self._transform_matrix = None
+        self._affine_dirty = True
+
+        # Persistent plot state: axes/artists are built once per data load and
+        # updated in place on transform ticks instead of figure.clf() each time.
+        self._plot_layout = None
+        self._gpx_plot_ax = None
+        self._gpx_plot_artists = None
+        self._map_refit_pending = True
+        self._map_html_template = None  # Folium HTML rendered lazily, once
+
         self.init_ui()
 
         # For demonstration, try loading a default SVG.
@@ -52,10 +107,12 @@ class MainWindow(QMainWindow):
         except Exception:
             pass
 
-        self.markerUpdateTimer = QTimer(self)
-        self.markerUpdateTimer.setInterval(500)  # every 500 ms
-        self.markerUpdateTimer.timeout.connect(self.poll_marker_drag_end)
-        self.markerUpdateTimer.start()
+        # Coalesces slider valueChanged storms: only the last value within the
+        # debounce window triggers the transform + redraw pipeline.
+        self.updateDebounceTimer = QTimer(self)
+        self.updateDebounceTimer.setSingleShot(True)
+        self.updateDebounceTimer.setInterval(40)  # ms
+        self.updateDebounceTimer.timeout.connect(self.update_final_gpx)
 
     def init_ui(self):
         central_widget = QWidget()
@@ -98,6 +155,9 @@ class MainWindow(QMainWindow):
             "font-size: 16px; padding: 5px 15px; background-color: #007ACC; color: white; border: none; border-radius: 6px;"
         )
         self.path_length_input.setFixedWidth(100)
+        # Validators keep invalid text from ever reaching the handlers, so the
+        # parse there no longer needs try/except
+        self.path_length_input.setValidator(QDoubleValidator(0.001, 1000.0, 3, self))
         self.path_length_input.editingFinished.connect(self.update_path_length_from_input)
         slider_layout.addWidget(self.path_length_input)
 
@@ -136,6 +196,7 @@ class MainWindow(QMainWindow):
             "font-size: 16px; padding: 5px 15px; background-color: #007ACC; color: white; border: none; border-radius: 6px;"
         )
         self.rotation_input.setFixedWidth(80)
+        self.rotation_input.setValidator(QIntValidator(-180, 180, self))
         self.rotation_input.editingFinished.connect(self.update_rotation_from_input)
         control_layout.addWidget(self.rotation_input)
 
@@ -160,6 +221,7 @@ class MainWindow(QMainWindow):
             "font-size: 16px; padding: 5px 15px; background-color: #007ACC; color: white; border: none; border-radius: 6px;"
         )
         self.stretch_input.setFixedWidth(80)
+        self.stretch_input.setValidator(QIntValidator(25, 400, self))
         self.stretch_input.editingFinished.connect(self.update_stretch_from_input)
         control_layout.addWidget(self.stretch_input)
 
@@ -199,9 +261,8 @@ class MainWindow(QMainWindow):
             file_name, _ = QFileDialog.getOpenFileName(self, "Open SVG File", self.project_path, "SVG Files (*.svg)")
         if file_name:
             try:
-                self.svg_paths, self.gpx_data_1_original = self.svg_gpx_manager.process_svg_file(file_name)                
-                self.gpx_data_2_scaled_translated = copy.deepcopy(self.gpx_data_1_original)
-                self.gpx_data_3_final = copy.deepcopy(self.gpx_data_1_original)
+                self.svg_paths, self.gpx_data_1_original = self.svg_gpx_manager.process_svg_file(file_name)
+                self.set_scaled_translated_gpx(copy.deepcopy(self.gpx_data_1_original))
                 self.status_label.setText(f"Loaded SVG: {file_name}")
 
                 self.update_all_slider_from_gpx(self.gpx_data_1_original)
@@ -217,9 +278,8 @@ class MainWindow(QMainWindow):
                 self.gpx_data_1_original = self.svg_gpx_manager.load_gpx(file_name)
                 
                 self.gpx_data_1_original = self.fix_lat_lon_scaling(self.gpx_data_1_original, reversed=True)  # So that after fix it won't transform
-                
-                self.gpx_data_2_scaled_translated = copy.deepcopy(self.gpx_data_1_original)
-                self.gpx_data_3_final = copy.deepcopy(self.gpx_data_1_original)
+
+                self.set_scaled_translated_gpx(copy.deepcopy(self.gpx_data_1_original))
                 self.svg_paths = None
                 self.status_label.setText(f"Loaded GPX: {file_name}")
 
@@ -247,109 +307,51 @@ class MainWindow(QMainWindow):
                 self.status_label.setText(f"Error saving GPX: {e}")
 
     def update_map_view(self, map_view, gpx_data, project_path):
-        coords = []
-        if gpx_data is not None:
-            for track in gpx_data.tracks:
-                for segment in track.segments:
-                    for point in segment.points:
-                        coords.append([point.latitude, point.longitude])
-        
+        # Refit the viewport only when new data arrived (load/recenter); slider
+        # ticks keep the current view instead of thrashing the tile renderer.
+        refit = self._map_refit_pending
+        self._map_refit_pending = False
+
+        if (
+            gpx_data is self.gpx_data_3_final
+            and self._affine_buffers is not None
+            and self._affine_buffers[0].size == len(self._final_points)
+        ):
+            # The affine outputs hold exactly the final coordinates; no need to
+            # re-read them from the point objects on every tick.
+            arr = np.column_stack((self._affine_buffers[0], self._affine_buffers[1]))
+        elif gpx_data is not None:
+            points = list(gpx_data.walk(only_points=True))
+            arr = np.fromiter(
+                (v for p in points for v in (p.latitude, p.longitude)), dtype=np.float64, count=2 * len(points)
+            ).reshape(-1, 2)
+        else:
+            arr = np.empty((0, 2))
+
+        # Simplify the display copy only (the full-resolution data is kept for
+        # saving): sub-meter wiggles render to sub-pixel anyway. 6 decimals
+        # (~10 cm) is likewise invisible and keeps the IPC payload small.
+        if arr.size:
+            keep = rdp_keep_mask(arr[:, 0], arr[:, 1], self.DISPLAY_SIMPLIFY_EPS_DEG)
+            coords = np.round(arr[keep], 6).tolist()
+        else:
+            coords = []
+        self._last_display_coords = coords  # Drag offsets are computed from these
+        if orjson is not None:
+            coords_json = orjson.dumps(coords).decode()
+        else:
+            coords_json = json.dumps(coords, separators=(",", ":"))
+
         if not hasattr(self, 'map_initialized') or not self.map_initialized:
-            # Initialize the map once with default settings and JS functions
-            m = folium.Map(location=[54.9048217, 23.9592468], zoom_start=14)  # Default view
-            m.get_root().html.add_child(folium.Element(
-                '<script src="https://unpkg.com/leaflet-path-drag@0.0.8/Path.Drag.js"></script>'
-            ))
-
-            coords_json = json.dumps(coords)
-            script = f"""
-            <script>
-            document.addEventListener("DOMContentLoaded", function() {{
-                var map = {m.get_name()};
-                window.map = map;
-                
-                // Initialize map elements
-                window.gpxPolyline = L.polyline({coords_json}, {{
-                    color: 'red',
-                    weight: 2.5,
-                    opacity: 1
-                }}).addTo(map);
-                
-                window.rect = L.rectangle(gpxPolyline.getBounds(), {{
-                    color: 'blue',
-                    weight: 1,
-                    dashArray: '5,5',
-                    fillOpacity: 0.0
-                }}).addTo(map);
-                
-                var bounds = gpxPolyline.getBounds();
-                var handlePos = L.latLng(bounds.getNorth(), (bounds.getWest() + bounds.getEast()) / 2);
-                window.handle = L.marker(handlePos, {{draggable: true}}).addTo(map);
-                
-                // Auto-zoom to path with padding if coordinates exist
-                if({coords_json}.length > 0) {{
-                    map.fitBounds(bounds.pad(0.3));  // Added padding
-                }}
-                
-                // Define update function
-                window.updateGPX = function(newCoords) {{
-                    gpxPolyline.setLatLngs(newCoords);
-                    rect.setBounds(gpxPolyline.getBounds());
-                    var newBounds = gpxPolyline.getBounds();
-                    
-                    // Update handle position
-                    var newHandlePos = L.latLng(
-                        newBounds.getNorth(),
-                        (newBounds.getWest() + newBounds.getEast()) / 2
-                    );
-                    handle.setLatLng(newHandlePos);
-                    
-                    // Auto-zoom to updated path with padding
-                    if(newCoords.length > 0) {{
-                        map.fitBounds(newBounds.pad(0.3));  // Added padding
-                    }}
-                }};
-                
-                // Rest of the script remains unchanged
-                // Drag handlers (initial setup)
-                var handleStartPos;
-                var originalCoords;
-                
-                handle.on('dragstart', function(e) {{
-                    handleStartPos = e.target.getLatLng();
-                    originalCoords = gpxPolyline.getLatLngs().map(l => [l.lat, l.lng]);
-                }});
-                
-                handle.on('drag', function(e) {{
-                    var newPos = e.target.getLatLng();
-                    var latOffset = newPos.lat - handleStartPos.lat;
-                    var lngOffset = newPos.lng - handleStartPos.lng;
-                    var newCoords = originalCoords.map(c => [c[0] + latOffset, c[1] + lngOffset]);
-                    gpxPolyline.setLatLngs(newCoords);
-                    rect.setBounds(gpxPolyline.getBounds());
-                }});
-                
-                handle.on('dragend', function(e) {{
-                    var newBounds = gpxPolyline.getBounds();
-                    var newHandlePos = L.latLng(
-                        newBounds.getNorth(),
-                        (newBounds.getWest() + newBounds.getEast()) / 2
-                    );
-                    handle.setLatLng(newHandlePos);
-                    window.markerDragEnded = true;
-                }});
-            }});
-            </script>
-            """
-            m.get_root().html.add_child(folium.Element(script))
-            map_view.setHtml(m.get_root().render())
+            # (Re)initialize the map from the cached HTML template; only the
+            # coords JSON differs between loads, so folium renders just once.
+            map_view.setHtml(self._get_map_html_template().replace("__COORDS_JSON__", coords_json))
             self.map_initialized = True
         else:
             # Update existing elements via JavaScript with auto-zoom
-            coords_json = json.dumps(coords)
             js_code = f"""
             if (typeof window.updateGPX === 'function') {{
-                window.updateGPX({coords_json});
+                window.updateGPX({coords_json}, {"true" if refit else "false"});
                 // Handle empty coordinates case
                 if({len(coords)} === 0) {{
                     map.setView([54.9048217, 23.9592468], 14);
@@ -358,96 +360,283 @@ class MainWindow(QMainWindow):
             """
             map_view.page().runJavaScript(js_code)
 
+    def _get_map_html_template(self):
+        """Render the folium map HTML once and cache it with a __COORDS_JSON__
+        placeholder; rebuilding the Map per load costs ~100 ms of rendering."""
+        if getattr(self, "_map_html_template", None) is not None:
+            return self._map_html_template
+
+        import folium
+
+        m = folium.Map(location=[54.9048217, 23.9592468], zoom_start=14)  # Default view
+        m.get_root().html.add_child(folium.Element(
+            '<script src="https://unpkg.com/leaflet-path-drag@0.0.8/Path.Drag.js"></script>'
+        ))
+        m.get_root().html.add_child(folium.Element(
+            '<script src="qrc:///qtwebchannel/qwebchannel.js"></script>'
+        ))
+
+        script = f"""
+        <script>
+        document.addEventListener("DOMContentLoaded", function() {{
+            var map = {m.get_name()};
+            window.map = map;
+
+            new QWebChannel(qt.webChannelTransport, function(channel) {{
+                window.bridge = channel.objects.bridge;
+            }});
+            
+            // Initialize map elements. Canvas renderer: one bulk draw call
+            // instead of an N-element SVG DOM; smoothFactor lets Leaflet
+            // thin the line per zoom level on top of the Python-side RDP.
+            window.gpxPolyline = L.polyline(__COORDS_JSON__, {{
+                renderer: L.canvas(),
+                smoothFactor: 1.5,
+                color: 'red',
+                weight: 2.5,
+                opacity: 1
+            }}).addTo(map);
+            
+            window.rect = L.rectangle(gpxPolyline.getBounds(), {{
+                color: 'blue',
+                weight: 1,
+                dashArray: '5,5',
+                fillOpacity: 0.0
+            }}).addTo(map);
+            
+            var bounds = gpxPolyline.getBounds();
+            var handlePos = L.latLng(bounds.getNorth(), (bounds.getWest() + bounds.getEast()) / 2);
+            window.handle = L.marker(handlePos, {{draggable: true}}).addTo(map);
+            
+            // Auto-zoom to path with padding if coordinates exist
+            if(__COORDS_JSON__.length > 0) {{
+                map.fitBounds(bounds.pad(0.3));  // Added padding
+            }}
+            
+            // Define update function
+            window.updateGPX = function(newCoords, refit) {{
+                gpxPolyline.setLatLngs(newCoords);
+                var newBounds = gpxPolyline.getBounds();
+                rect.setBounds(newBounds);
+
+                // Update handle position
+                var newHandlePos = L.latLng(
+                    newBounds.getNorth(),
+                    (newBounds.getWest() + newBounds.getEast()) / 2
+                );
+                handle.setLatLng(newHandlePos);
+
+                // Auto-zoom only on load/recenter; refitting on every
+                // slider tick would re-project the viewport each time
+                if(refit && newCoords.length > 0) {{
+                    map.fitBounds(newBounds.pad(0.3));  // Added padding
+                }}
+            }};
+            
+            // Rest of the script remains unchanged
+            // Drag handlers (initial setup). Original coords are captured as
+            // flat Float64Arrays and shifted into a reused coords array, so a
+            // drag frame allocates nothing regardless of track length.
+            var handleStartPos;
+            var origLat, origLng, dragCoords;
+
+            handle.on('dragstart', function(e) {{
+                handleStartPos = e.target.getLatLng();
+                var latlngs = gpxPolyline.getLatLngs();
+                var n = latlngs.length;
+                origLat = new Float64Array(n);
+                origLng = new Float64Array(n);
+                dragCoords = new Array(n);
+                for (var i = 0; i < n; i++) {{
+                    origLat[i] = latlngs[i].lat;
+                    origLng[i] = latlngs[i].lng;
+                    dragCoords[i] = [0, 0];
+                }}
+            }});
+
+            handle.on('drag', function(e) {{
+                // Pointer events can fire 100+/s; recompute at most once per
+                // animation frame so drag work is capped at the display rate
+                window._dragPos = e.target.getLatLng();
+                if (!window._dragRaf) {{
+                    window._dragRaf = requestAnimationFrame(function() {{
+                        window._dragRaf = null;
+                        var latOffset = window._dragPos.lat - handleStartPos.lat;
+                        var lngOffset = window._dragPos.lng - handleStartPos.lng;
+                        for (var i = 0; i < dragCoords.length; i++) {{
+                            dragCoords[i][0] = origLat[i] + latOffset;
+                            dragCoords[i][1] = origLng[i] + lngOffset;
+                        }}
+                        gpxPolyline.setLatLngs(dragCoords);
+                        rect.setBounds(gpxPolyline.getBounds());
+                    }});
+                }}
+            }});
+            
+            handle.on('dragend', function(e) {{
+                var newBounds = gpxPolyline.getBounds();
+                var newHandlePos = L.latLng(
+                    newBounds.getNorth(),
+                    (newBounds.getWest() + newBounds.getEast()) / 2
+                );
+                handle.setLatLng(newHandlePos);
+                if (window.bridge) {{
+                    bridge.on_marker_drag_end(gpxPolyline.getLatLngs().map(l => [l.lat, l.lng]));
+                }}
+            }});
+        }});
+        </script>
+        """
+        m.get_root().html.add_child(folium.Element(script))
+        self._map_html_template = m.get_root().render()
+        return self._map_html_template
+
     def reload_gui(self):
         if self.gpx_data_3_final is None:
             self.status_label.setText("No GPX data to display. Load an SVG or GPX file first.")
             return
 
-        self.plot_canvas.figure.clf()
-
-        if self.svg_paths is not None:
-            ax1 = self.plot_canvas.figure.add_subplot(121)
-            ax2 = self.plot_canvas.figure.add_subplot(122)
-            self.svg_gpx_manager.plot_svg(self.svg_paths, ax1)
-            self.svg_gpx_manager.plot_gpx(self.gpx_data_3_final, ax2)
-            ax1.set_title("SVG Path")
-            ax2.set_title("GPX Path")
-            ax1.set_aspect("equal", "box")
-            ax2.set_aspect("equal", "box")
+        layout = "dual" if self.svg_paths is not None else "single"
+        if layout != self._plot_layout:
+            # Layout (or loaded data) changed: rebuild axes and artists once.
+            self.plot_canvas.figure.clf()
+            if layout == "dual":
+                ax1 = self.plot_canvas.figure.add_subplot(121)
+                self._gpx_plot_ax = self.plot_canvas.figure.add_subplot(122)
+                self.svg_gpx_manager.plot_svg(self.svg_paths, ax1)
+                ax1.set_title("SVG Path")
+                ax1.set_aspect("equal", "box")
+            else:
+                self._gpx_plot_ax = self.plot_canvas.figure.add_subplot(111)
+            self._gpx_plot_artists = self.svg_gpx_manager.plot_gpx(
+                self.gpx_data_3_final, self._gpx_plot_ax, simplify_eps=self.DISPLAY_SIMPLIFY_EPS_DEG
+            )
+            self._gpx_plot_ax.set_title("GPX Path")
+            self._gpx_plot_ax.set_aspect("equal", "box")
+            self.plot_canvas.figure.tight_layout()
+            self._plot_layout = layout
         else:
-            ax = self.plot_canvas.figure.add_subplot(111)
-            self.svg_gpx_manager.plot_gpx(self.gpx_data_3_final, ax)
-            ax.set_title("GPX Path")
-            ax.set_aspect("equal", "box")
-
-        self.plot_canvas.figure.tight_layout()
-        self.plot_canvas.draw()
+            # Transform tick: push new coordinates into the existing artists.
+            self.svg_gpx_manager.update_gpx_plot(
+                self.gpx_data_3_final, self._gpx_plot_ax, self._gpx_plot_artists, simplify_eps=self.DISPLAY_SIMPLIFY_EPS_DEG
+            )
+        self.plot_canvas.draw_idle()
 
         self.update_map_view(self.map_view, self.gpx_data_3_final, self.project_path)
 
-    def scale_gpx_path(self, gpx, scale_factor):
-        center_lat, center_lon = self.svg_gpx_manager.get_path_center_lat_lon(gpx)
-        if not center_lat or not center_lon:
-            return gpx
-
-        gpx_scaled = self.svg_gpx_manager.scale_gpx_around_point(gpx, center_lat, center_lon, scale_factor)
-
-        return gpx_scaled
-
-    def translate_gpx_path(self, gpx, lat_offset, lng_offset):
-        new_gpx = copy.deepcopy(gpx)
-        for track in new_gpx.tracks:
-            for segment in track.segments:
-                for p in segment.points:
-                    p.latitude += lat_offset
-                    p.longitude += lng_offset
-        return new_gpx
-
-    def gpx_transform_and_rotate(self, gpx):
-        new_gpx = copy.deepcopy(gpx)
-
-        lat_sum, lon_sum, count = 0.0, 0.0, 0
-        for track in new_gpx.tracks:
-            for segment in track.segments:
-                for p in segment.points:
-                    lat_sum += p.latitude
-                    lon_sum += p.longitude
-                    count += 1
-
-        if count == 0:
-            return new_gpx
-
-        center_lat = lat_sum / count
-        center_lon = lon_sum / count
-
-        # Apply horizontal scaling (scale only the longitude relative to center)
-        for track in new_gpx.tracks:
-            for segment in track.segments:
-                for p in segment.points:
-                    p.longitude = center_lon + self.hor_scale * (p.longitude - center_lon)
+    def _gpx_to_arrays(self, gpx):
+        """Flatten all track points once into (points, lats, lons) SoA arrays."""
+        points = list(gpx.walk(only_points=True))
+        lats = np.fromiter((p.latitude for p in points), dtype=np.float64, count=len(points))
+        lons = np.fromiter((p.longitude for p in points), dtype=np.float64, count=len(points))
+        return points, lats, lons
+
+    def _write_back_arrays(self, points, lats, lons):
+        for p, lat, lon in zip(points, lats.tolist(), lons.tolist()):
+            p.latitude = lat
+            p.longitude = lon
+
+    def scale_base_gpx(self, scale_factor):
+        """Uniformly scale the working path about its centroid in place,
+        mirroring translate_base_gpx: vectorized ops on the cached SoA arrays
+        instead of deepcopy + full cache rebuild."""
+        center_lat, center_lon = self._base_centroid
+        if center_lat is None:
+            return
 
-        # Apply rotation around the centroid.
+        self._base_lats -= center_lat
+        self._base_lats *= scale_factor
+        self._base_lats += center_lat
+        self._base_lons -= center_lon
+        self._base_lons *= scale_factor
+        self._base_lons += center_lon
+        self._write_back_arrays(self._base_points, self._base_lats, self._base_lons)
+
+        # Centroid and transform matrix are unchanged (scaling is about the
+        # centroid); the metric length scales by exactly the factor.
+        if self._base_length_km is not None:
+            self._base_length_km *= scale_factor
+        self._map_refit_pending = True
+
+    def translate_base_gpx(self, lat_offset, lon_offset):
+        """Translate the working path in place: two vectorized adds on the
+        cached SoA arrays instead of deepcopy + full cache rebuild. Only the
+        caches a translation actually invalidates are touched."""
+        self._base_lats += lat_offset
+        self._base_lons += lon_offset
+        self._write_back_arrays(self._base_points, self._base_lats, self._base_lons)
+
+        center_lat, center_lon = self._base_centroid
+        if center_lat is not None:
+            self._base_centroid = (center_lat + lat_offset, center_lon + lon_offset)
+        self._base_length_km = None  # Moving in latitude changes metric length
+        self._affine_dirty = True  # Centroid latitude feeds the lat/lon fix
+        self._map_refit_pending = True
+
+    def build_transform_matrix(self, avg_lat):
+        """Compose horizontal stretch, rotation and the lat/lon distance fix
+        into a single 2x2 matrix acting on (dlon, dlat) offsets from the
+        centroid. All three are linear maps about the same center (stretch and
+        rotation preserve the centroid), so they fuse into one pass."""
         angle_rad = -math.radians(self.rotation)
         cos_a = math.cos(angle_rad)
         sin_a = math.sin(angle_rad)
-        for track in new_gpx.tracks:
-            for segment in track.segments:
-                for p in segment.points:
-                    dlat = p.latitude - center_lat
-                    dlon = p.longitude - center_lon
-                    new_dlon = dlon * cos_a - dlat * sin_a
-                    new_dlat = dlon * sin_a + dlat * cos_a
-                    p.longitude = center_lon + new_dlon
-                    p.latitude = center_lat + new_dlat
-
-        return new_gpx
+        stretch = np.array([[self.hor_scale, 0.0], [0.0, 1.0]])
+        rotation = np.array([[cos_a, -sin_a], [sin_a, cos_a]])
+        latlon_fix = np.array([[1 / math.cos(math.radians(avg_lat)), 0.0], [0.0, 1.0]])
+        return latlon_fix @ rotation @ stretch
+
+    def set_scaled_translated_gpx(self, gpx):
+        """Set the working (scaled/translated) GPX and refresh the cached SoA
+        state. The final tree is deep-copied once here, not per transform tick."""
+        self.gpx_data_2_scaled_translated = gpx
+        self._base_points, self._base_lats, self._base_lons = self._gpx_to_arrays(gpx)
+        self.gpx_data_3_final = copy.deepcopy(gpx)
+        self._final_points = list(self.gpx_data_3_final.walk(only_points=True))
+
+        # Centroid is needed every tick, length on every slider event; compute
+        # them once per change of the working data instead.
+        if self._base_lats.size:
+            self._base_centroid = (self._base_lats.mean(), self._base_lons.mean())
+        else:
+            self._base_centroid = (None, None)
+        # Scratch buffers for the per-tick affine, reallocated only when the
+        # point count changes so slider ticks run allocation-free.
+        if self._affine_buffers is None or self._affine_buffers[0].size != self._base_lats.size:
+            self._affine_buffers = make_affine_buffers(self._base_lats.size)
+        self._base_length_km = None  # Computed lazily by base_path_length_km
+        self._affine_dirty = True  # Centroid latitude feeds the lat/lon fix
+        self._plot_layout = None  # New data: reload_gui must rebuild the axes
+        self._map_refit_pending = True  # New data: refit the map viewport once
+
+    def base_path_length_km(self):
+        """Length of the working path, cached until the working data changes
+        (stretch/rotation in update_final_gpx never change it meaningfully)."""
+        if self._base_length_km is None:
+            self._base_length_km = self.svg_gpx_manager.calculate_gpx_length_km(self.gpx_data_2_scaled_translated)
+        return self._base_length_km
+
+    def schedule_update_final_gpx(self):
+        """Debounced update_final_gpx; restarting the timer resets the wait."""
+        self.updateDebounceTimer.start()
 
     def update_final_gpx(self):
         if self.gpx_data_2_scaled_translated is None:
             return
 
-        gpx_data_transformed = self.gpx_transform_and_rotate(self.gpx_data_2_scaled_translated)
-        self.gpx_data_3_final = self.fix_lat_lon_scaling(gpx_data_transformed)
+        lats, lons = self._base_lats, self._base_lons
+        if lats.size:
+            center_lat, center_lon = self._base_centroid
+            if self._affine_dirty or self._transform_matrix is None:
+                self._transform_matrix = self.build_transform_matrix(center_lat)
+                self._affine_dirty = False
+            m = self._transform_matrix
+
+            new_lats, new_lons = affine_apply(
+                lats, lons, m[0, 0], m[0, 1], m[1, 0], m[1, 1], center_lat, center_lon, out=self._affine_buffers
+            )
+
+            self._write_back_arrays(self._final_points, new_lats, new_lons)
 
         self.reload_gui()
 
@@ -464,77 +653,79 @@ class MainWindow(QMainWindow):
         if target_length_km <= 0 or self.gpx_data_1_original is None:
             return
 
-        original_length_km = self.svg_gpx_manager.calculate_gpx_length_km(self.gpx_data_2_scaled_translated)
-        if original_length_km == 0:
+        original_length_km = self.base_path_length_km()
+        if original_length_km == 0 or target_length_km == original_length_km:
             return
 
         scale_factor = target_length_km / original_length_km
-        self.gpx_data_2_scaled_translated = self.scale_gpx_path(self.gpx_data_2_scaled_translated, scale_factor)
-        self.update_final_gpx()
+        self.scale_base_gpx(scale_factor)
+        # Uniform scaling multiplies the metric length by exactly the same
+        # factor, so seed the cache rather than re-walking the path next tick.
+        self._base_length_km = target_length_km
+        self.schedule_update_final_gpx()
 
     def update_path_length_from_slider(self):
         slider_value = self.path_length_slider.value()
 
         target_length_km = self.len_slider_to_km(slider_value)
 
-        self.path_length_input.blockSignals(True)
-        self.path_length_input.setText(f"{target_length_km:.2f}")
-        self.path_length_input.blockSignals(False)
+        with QSignalBlocker(self.path_length_input):
+            self.path_length_input.setText(f"{target_length_km:.2f}")
 
         self.resize_to_target_path_length(target_length_km)
 
     def update_path_length_from_input(self):
-        text = self.path_length_input.text()
-        try:
-            target_length_km = float(text)
-        except ValueError:
+        # The validators are locale-aware ("1,000" or "1,5" can be Acceptable
+        # depending on locale), so parse through the same locale here and in
+        # the int handlers below; float()/int() would raise inside the slot.
+        target_length_km, ok = self.locale().toDouble(self.path_length_input.text())
+        if not ok:
             return
 
-        print(f"target_length_km {target_length_km}, slider {self.len_km_to_slider(target_length_km)}")
-
-        self.path_length_slider.blockSignals(True)
-        self.path_length_slider.setValue(self.len_km_to_slider(target_length_km))
-        self.path_length_slider.blockSignals(False)
+        with QSignalBlocker(self.path_length_slider):
+            self.path_length_slider.setValue(self.len_km_to_slider(target_length_km))
 
         self.resize_to_target_path_length(target_length_km)
 
     def update_rotation_from_slider(self):
         value = self.rotation_slider.value()
-        self.rotation_input.blockSignals(True)
-        self.rotation_input.setText(str(value))
-        self.rotation_input.blockSignals(False)
+        if value == self.rotation:  # Spurious/blockSignals round-trip no-op
+            return
+        with QSignalBlocker(self.rotation_input):
+            self.rotation_input.setText(str(value))
         self.rotation = value
-        self.update_final_gpx()
+        self._affine_dirty = True
+        self.schedule_update_final_gpx()
 
     def update_rotation_from_input(self):
-        try:
-            value = int(self.rotation_input.text())
-        except:
+        value, ok = self.locale().toInt(self.rotation_input.text())
+        if not ok or value == self.rotation:
             return
-        self.rotation_slider.blockSignals(True)
-        self.rotation_slider.setValue(value)
-        self.rotation_slider.blockSignals(False)
+        with QSignalBlocker(self.rotation_slider):
+            self.rotation_slider.setValue(value)
         self.rotation = value
-        self.update_final_gpx()
+        self._affine_dirty = True
+        self.schedule_update_final_gpx()
 
     def update_stretch_from_slider(self):
         value = self.stretch_slider.value()
-        self.stretch_input.blockSignals(True)
-        self.stretch_input.setText(f"{value}")
-        self.stretch_input.blockSignals(False)
+        if value / 100.0 == self.hor_scale:
+            return
+        with QSignalBlocker(self.stretch_input):
+            self.stretch_input.setText(f"{value}")
         self.hor_scale = value / 100.0
-        self.update_final_gpx()
+        self._affine_dirty = True
+        self.schedule_update_final_gpx()
 
     def update_stretch_from_input(self):
-        try:
-            value = int(self.stretch_input.text())
-        except:
+        value, ok = self.locale().toInt(self.stretch_input.text())
+        if not ok or value / 100.0 == self.hor_scale:
             return
-        self.stretch_slider.blockSignals(True)
-        self.stretch_slider.setValue(value)
-        self.stretch_slider.blockSignals(False)
+        with QSignalBlocker(self.stretch_slider):
+            self.stretch_slider.setValue(value)
         self.hor_scale = value / 100.0
-        self.update_final_gpx()
+        self._affine_dirty = True
+        self.schedule_update_final_gpx()
 
     def move_path_to_center(self):
         self.map_view.page().runJavaScript("map.getCenter()", self.move_path_to_center_js_cb)
@@ -543,50 +734,32 @@ class MainWindow(QMainWindow):
         if not map_center:
             return
 
-        center_lat, center_lon = self.svg_gpx_manager.get_path_center_lat_lon(self.gpx_data_2_scaled_translated)
+        # The working centroid is cached alongside the SoA arrays; no need to
+        # traverse the path again here.
+        center_lat, center_lon = self._base_centroid
+        if center_lat is None:
+            return
 
         lat_offset = map_center["lat"] - center_lat
         lon_offset = map_center["lng"] - center_lon
 
-        self.gpx_data_2_scaled_translated = self.translate_gpx_path(self.gpx_data_2_scaled_translated, lat_offset, lon_offset)
+        self.translate_base_gpx(lat_offset, lon_offset)
 
         self.update_final_gpx()
 
-    def poll_marker_drag_end(self):
-        self.map_view.page().runJavaScript("window.markerDragEnded", self.handle_marker_drag_end)
-
-    def handle_marker_drag_end(self, dragEnded):
-        if dragEnded:
-            self.map_view.page().runJavaScript("JSON.stringify(window.gpxPolyline.getLatLngs())", self.translate_gpx_with_marker)
-            self.map_view.page().runJavaScript("window.markerDragEnded = false;")
-
-    def translate_gpx_with_marker(self, js_result):
-        try:
-            coords_list = json.loads(js_result)
-        except Exception as e:
-            coords_list = None
-            print("Error parsing JS result in _update_gpx_from_marker:", e)
-
-        gpx_from_map = copy.deepcopy(self.gpx_data_2_scaled_translated)
-        if coords_list is not None:
-            i = 0
-            for track in gpx_from_map.tracks:
-                for segment in track.segments:
-                    for p in segment.points:
-                        if i < len(coords_list):
-                            p.latitude = coords_list[i]["lat"]
-                            p.longitude = coords_list[i]["lng"]
-                            i += 1
-
-            center_lat_prev, center_lon_prev = self.svg_gpx_manager.get_path_center_lat_lon(self.gpx_data_2_scaled_translated)
-            center_lat_new, center_lon_new = self.svg_gpx_manager.get_path_center_lat_lon(gpx_from_map)
+    def translate_gpx_with_marker(self, coords_list):
+        if not coords_list or not self._last_display_coords:
+            return
 
-            lat_offset = center_lat_new - center_lat_prev
-            lon_offset = center_lon_new - center_lon_prev
+        # The drag moved every displayed point by the same offset, so comparing
+        # one point against the coords last sent to the map recovers it exactly
+        # (no deepcopy, no centroid recomputation over the whole path).
+        lat_offset = coords_list[0][0] - self._last_display_coords[0][0]
+        lon_offset = coords_list[0][1] - self._last_display_coords[0][1]
 
-            self.gpx_data_2_scaled_translated = self.translate_gpx_path(self.gpx_data_2_scaled_translated, lat_offset, lon_offset)
+        self.translate_base_gpx(lat_offset, lon_offset)
 
-            self.update_final_gpx()
+        self.update_final_gpx()
 
     def fix_lat_lon_scaling(self, gpx, reversed=False):
         """Adjust or reverse longitude scaling so that degrees produce equal distances as latitudes.
@@ -595,31 +768,18 @@ class MainWindow(QMainWindow):
         This uses the average latitude to compute the correction factor.
         """
         new_gpx = copy.deepcopy(gpx)
-        lat_sum, lon_sum, count = 0.0, 0.0, 0
-
-        for track in new_gpx.tracks:
-            for segment in track.segments:
-                for p in segment.points:
-                    lat_sum += p.latitude
-                    lon_sum += p.longitude
-                    count += 1
-
-        if count == 0:
+        points, lats, lons = self._gpx_to_arrays(new_gpx)
+        if not points:
             return new_gpx
 
-        avg_lat = lat_sum / count
+        avg_lat = lats.mean()
         factor = 1 / math.cos(math.radians(avg_lat))
-        
+
         # If reversed, invert the scaling factor
         factor = 1 / factor if reversed else factor
 
-        center_lon = lon_sum / count
-
-        for track in new_gpx.tracks:
-            for segment in track.segments:
-                for p in segment.points:
-                    p.longitude = center_lon + (p.longitude - center_lon) * factor
-
+        center_lon = lons.mean()
+        self._write_back_arrays(points, lats, center_lon + (lons - center_lon) * factor)
         return new_gpx
 
 